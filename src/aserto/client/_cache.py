@@ -0,0 +1,65 @@
+import threading
+from time import monotonic
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+__all__ = ["TTLCache"]
+
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """A small bounded cache whose entries expire `ttl` seconds after they are stored.
+
+    Every call to `clear` starts a new generation. Values computed before the clear
+    are dropped by `put`, so an in-flight request can't repopulate the cache with a
+    stale result.
+
+    The cache is safe to share between threads.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, V]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires, value = entry
+            if expires <= monotonic():
+                del self._entries[key]
+                return None
+
+            return value
+
+    def put(self, key: Hashable, value: V, generation: int) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return
+
+            now = monotonic()
+            entries = self._entries
+            entries.pop(key, None)
+            if len(entries) >= self._maxsize:
+                # All entries share one TTL and are stored in insertion order, so expired
+                # entries are at the front and the first entry always expires soonest.
+                while entries:
+                    first = next(iter(entries))
+                    if entries[first][0] > now:
+                        break
+                    del entries[first]
+            if len(entries) >= self._maxsize:
+                del entries[next(iter(entries))]
+
+            self._entries[key] = (now + self._ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
@@ -0,0 +1,29 @@
+import functools
+from typing import Any, List, Optional, Sequence, Tuple
+
+from grpc import ChannelCredentials, ssl_channel_credentials
+
+__all__ = ["ChannelOptions", "DEFAULT_CHANNEL_OPTIONS", "ssl_credentials", "with_default_options"]
+
+
+ChannelOptions = Sequence[Tuple[str, Any]]
+
+# Go gRPC servers (including topaz) reject keepalive pings sent more often than every 5 minutes.
+DEFAULT_CHANNEL_OPTIONS: ChannelOptions = (
+    ("grpc.keepalive_time_ms", 300_000),
+    ("grpc.keepalive_timeout_ms", 20_000),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_receive_message_length", 32 * 1024 * 1024),
+)
+
+
+def with_default_options(options: Optional[ChannelOptions]) -> List[Tuple[str, Any]]:
+    merged = dict(DEFAULT_CHANNEL_OPTIONS)
+    merged.update(options or ())
+    return list(merged.items())
+
+
+@functools.lru_cache(maxsize=8)
+def ssl_credentials(cert: Optional[bytes]) -> ChannelCredentials:
+    # Clients that connect with the same certificate share the parsed credentials.
+    return ssl_channel_credentials(cert)
@@ -2,7 +2,6 @@ import datetime
 import typing
 
 import aserto.authorizer.v2 as authorizer
-import aserto.authorizer.v2.api as api
 import grpc.aio as grpc
 from aserto.authorizer.v2 import (
     CompileResponse,
@@ -12,11 +11,12 @@ from aserto.authorizer.v2 import (
     QueryResponse,
 )
 from aserto.authorizer.v2.api import IdentityContext, IdentityType
-from grpc import ssl_channel_credentials
 
 import aserto.client._deadline as timeout
 import aserto.client.authorizer.helpers as helpers
 import aserto.client.resource_context as res_ctx
+from aserto.client._cache import TTLCache
+from aserto.client._channel import ChannelOptions, ssl_credentials, with_default_options
 from aserto.client.authorizer.helpers import DecisionTree
 from aserto.client.identity import Identity
 from aserto.client.options import AuthorizerOptions
@@ -30,27 +30,42 @@ class AuthorizerClient:
         tenant_id: typing.Optional[str] = None,
         identity: Identity,
         options: AuthorizerOptions,
+        channel_options: typing.Optional[ChannelOptions] = None,
+        channel: typing.Optional[grpc.Channel] = None,
+        decision_cache_ttl: typing.Optional[datetime.timedelta] = None,
     ) -> None:
         self._tenant_id = tenant_id
         self._options = options
+        # auth headers are fixed for the lifetime of the options, so the metadata is built once.
+        # It's an immutable tuple so that interceptors can't mutate metadata shared across calls.
+        self._metadata = tuple(self._headers.items())
         self._identity_context_field = IdentityContext(
             identity=identity.value or "",
             type=identity.type,
         )
-        self._channel = grpc.secure_channel(
-            target=self._options.url,
-            credentials=ssl_channel_credentials(self._options.cert),
+        # A caller-provided channel can be shared by clients for different identities
+        # and is never closed here.
+        self._owns_channel = channel is None
+        self._channel = (
+            channel
+            if channel is not None
+            else grpc.secure_channel(
+                target=self._options.url,
+                credentials=ssl_credentials(self._options.cert),
+                options=with_default_options(channel_options),
+            )
         )
         self.client = authorizer.AuthorizerStub(self._channel)
+        # Decisions are only cached when a TTL is given. The identity is fixed per client, so it
+        # isn't part of the cache key.
+        self._decision_cache: typing.Optional[TTLCache[typing.Dict[str, bool]]] = (
+            TTLCache(decision_cache_ttl.total_seconds()) if decision_cache_ttl is not None else None
+        )
 
     @property
     def _headers(self) -> typing.Mapping[str, str]:
         return self._options.auth_headers
 
-    @property
-    def _metadata(self) -> grpc.Metadata:
-        return grpc.Metadata(*tuple(self._headers.items()))
-
     async def decision_tree(
         self,
         *,
@@ -62,22 +77,14 @@ class AuthorizerClient:
         policy_path_separator: typing.Optional[typing.Literal["DOT", "SLASH"]] = None,
         deadline: typing.Optional[typing.Union[datetime.datetime, datetime.timedelta]] = None,
     ) -> DecisionTree:
-        options = authorizer.DecisionTreeOptions()
-        if policy_path_separator is not None:
-            options.path_separator = helpers.policy_path_separator_field(policy_path_separator)
-
         response = await self.client.DecisionTree(
             authorizer.DecisionTreeRequest(
-                policy_context=api.PolicyContext(
-                    path=policy_path_root,
-                    decisions=list(decisions),
-                ),
+                policy_context=helpers.policy_context(policy_path_root, tuple(decisions)),
                 identity_context=self._identity_context_field,
                 resource_context=res_ctx.serialize_resource_context(resource_context or {}),
-                options=options,
-                policy_instance=api.PolicyInstance(
-                    name=policy_instance_name,
-                    instance_label=policy_instance_label,
+                options=helpers.decision_tree_options(policy_path_separator),
+                policy_instance=helpers.policy_instance(
+                    policy_instance_name, policy_instance_label
                 ),
             ),
             metadata=self._metadata,
@@ -98,17 +105,31 @@ class AuthorizerClient:
         resource_context: typing.Optional[ResourceContext] = None,
         deadline: typing.Optional[typing.Union[datetime.datetime, datetime.timedelta]] = None,
     ) -> typing.Dict[str, bool]:
+        decisions = tuple(decisions)
+        resource_context_field = res_ctx.serialize_resource_context(resource_context or {})
+
+        cache = self._decision_cache
+        cache_key, generation = None, 0
+        if cache is not None:
+            cache_key = (
+                policy_path,
+                decisions,
+                policy_instance_name,
+                policy_instance_label,
+                resource_context_field.SerializeToString(deterministic=True),
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+            generation = cache.generation
+
         response = await self.client.Is(
             authorizer.IsRequest(
-                policy_context=api.PolicyContext(
-                    path=policy_path,
-                    decisions=list(decisions),
-                ),
+                policy_context=helpers.policy_context(policy_path, decisions),
                 identity_context=self._identity_context_field,
-                resource_context=res_ctx.serialize_resource_context(resource_context or {}),
-                policy_instance=api.PolicyInstance(
-                    name=policy_instance_name,
-                    instance_label=policy_instance_label,
+                resource_context=resource_context_field,
+                policy_instance=helpers.policy_instance(
+                    policy_instance_name, policy_instance_label
                 ),
             ),
             metadata=self._metadata,
@@ -116,12 +137,37 @@ class AuthorizerClient:
                 timeout.monotonic_time_from_deadline(deadline) if deadline is not None else None
             ),
         )
-        results = {}
-        for decision_object in response.decisions:
-            results[decision_object.decision] = getattr(decision_object, "is")
+
+        results = helpers.decision_results(response)
+        if cache is not None:
+            cache.put(cache_key, dict(results), generation)
 
         return results
 
+    async def decisions_batch(
+        self,
+        *,
+        queries: typing.Sequence[typing.Tuple[str, typing.Sequence[str]]],
+        policy_instance_name: typing.Optional[str] = None,
+        policy_instance_label: typing.Optional[str] = None,
+        resource_context: typing.Optional[ResourceContext] = None,
+        deadline: typing.Optional[typing.Union[datetime.datetime, datetime.timedelta]] = None,
+    ) -> DecisionTree:
+        if not queries:
+            return {}
+
+        decision_tree = await self.decision_tree(
+            policy_path_root=helpers.common_policy_path_root(path for path, _ in queries),
+            decisions=sorted({name for _, decisions in queries for name in decisions}),
+            policy_instance_name=policy_instance_name,
+            policy_instance_label=policy_instance_label,
+            resource_context=resource_context,
+            policy_path_separator="DOT",
+            deadline=deadline,
+        )
+
+        return helpers.select_decisions(decision_tree, queries)
+
     async def query(
         self,
         *,
@@ -140,15 +186,11 @@ class AuthorizerClient:
                 query=query,
                 input=input,
                 options=options,
-                policy_context=api.PolicyContext(
-                    path=policy_path,
-                    decisions=list(decisions),
-                ),
+                policy_context=helpers.policy_context(policy_path, tuple(decisions)),
                 identity_context=self._identity_context_field,
                 resource_context=res_ctx.serialize_resource_context(resource_context or {}),
-                policy_instance=api.PolicyInstance(
-                    name=policy_instance_name,
-                    instance_label=policy_instance_label,
+                policy_instance=helpers.policy_instance(
+                    policy_instance_name, policy_instance_label
                 ),
             ),
             metadata=self._metadata,
@@ -181,15 +223,11 @@ class AuthorizerClient:
                 unknowns=list(unknowns),
                 disable_inlining=list(disable_inlining),
                 options=options,
-                policy_context=api.PolicyContext(
-                    path=policy_path,
-                    decisions=list(decisions),
-                ),
+                policy_context=helpers.policy_context(policy_path, tuple(decisions)),
                 identity_context=self._identity_context_field,
                 resource_context=res_ctx.serialize_resource_context(resource_context or {}),
-                policy_instance=api.PolicyInstance(
-                    name=policy_instance_name,
-                    instance_label=policy_instance_label,
+                policy_instance=helpers.policy_instance(
+                    policy_instance_name, policy_instance_label
                 ),
             ),
             metadata=self._metadata,
@@ -209,9 +247,8 @@ class AuthorizerClient:
     ) -> ListPoliciesResponse:
         response = await self.client.ListPolicies(
             authorizer.ListPoliciesRequest(
-                policy_instance=api.PolicyInstance(
-                    name=policy_instance_name,
-                    instance_label=policy_instance_label,
+                policy_instance=helpers.policy_instance(
+                    policy_instance_name, policy_instance_label
                 ),
             ),
             metadata=self._metadata,
@@ -233,9 +270,8 @@ class AuthorizerClient:
         return await self.client.GetPolicy(
             authorizer.GetPolicyRequest(
                 id=id,
-                policy_instance=api.PolicyInstance(
-                    name=policy_instance_name,
-                    instance_label=policy_instance_label,
+                policy_instance=helpers.policy_instance(
+                    policy_instance_name, policy_instance_label
                 ),
             ),
             metadata=self._metadata,
@@ -244,7 +280,14 @@ class AuthorizerClient:
             ),
         )
 
+    def invalidate(self) -> None:
+        """Clears cached decisions, e.g. after a policy or directory change"""
+
+        if self._decision_cache is not None:
+            self._decision_cache.clear()
+
     async def close(self) -> None:
-        """Closes the gRPC channel"""
+        """Closes the gRPC channel unless it was provided by the caller"""
 
-        await self._channel.close()
+        if self._owns_channel:
+            await self._channel.close()
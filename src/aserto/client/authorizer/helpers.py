@@ -1,19 +1,76 @@
-from typing import Dict, Literal
+import functools
+import operator
+import os.path
+from typing import Dict, Iterable, Literal, Optional, Sequence, Tuple
 
-from aserto.authorizer.v2 import DecisionTreeResponse, PathSeparator
-
-from aserto.client._typing import assert_unreachable
+import aserto.authorizer.v2.api as api
+from aserto.authorizer.v2 import (
+    DecisionTreeOptions,
+    DecisionTreeResponse,
+    IsResponse,
+    PathSeparator,
+)
 
 DecisionTree = Dict[str, Dict[str, bool]]
 
+# "is" is a Python keyword, so the field can't be read with plain attribute access.
+_decision_is = operator.attrgetter("is")
+
+_PATH_SEPARATORS: Dict[Literal["DOT", "SLASH"], PathSeparator] = {
+    "DOT": PathSeparator.PATH_SEPARATOR_DOT,
+    "SLASH": PathSeparator.PATH_SEPARATOR_SLASH,
+}
+
 
 def policy_path_separator_field(policy_path_separator: Literal["DOT", "SLASH"]) -> PathSeparator:
-    if policy_path_separator == "DOT":
-        return PathSeparator.PATH_SEPARATOR_DOT
-    elif policy_path_separator == "SLASH":
-        return PathSeparator.PATH_SEPARATOR_SLASH
-    else:
-        assert_unreachable(policy_path_separator)
+    try:
+        return _PATH_SEPARATORS[policy_path_separator]
+    except KeyError:
+        raise ValueError(f"unsupported policy path separator: {policy_path_separator}") from None
+
+
+# The cached messages are shared between requests and must not be modified.
+@functools.lru_cache(maxsize=256)
+def policy_instance(name: Optional[str], label: Optional[str]) -> api.PolicyInstance:
+    return api.PolicyInstance(name=name, instance_label=label)
+
+
+@functools.lru_cache(maxsize=256)
+def policy_context(path: str, decisions: Tuple[str, ...]) -> api.PolicyContext:
+    return api.PolicyContext(path=path, decisions=decisions)
+
+
+@functools.lru_cache(maxsize=None)
+def decision_tree_options(
+    policy_path_separator: Optional[Literal["DOT", "SLASH"]],
+) -> DecisionTreeOptions:
+    if policy_path_separator is None:
+        return DecisionTreeOptions()
+
+    return DecisionTreeOptions(path_separator=policy_path_separator_field(policy_path_separator))
+
+
+def decision_results(response: IsResponse) -> Dict[str, bool]:
+    return {decision.decision: _decision_is(decision) for decision in response.decisions}
+
+
+def common_policy_path_root(policy_paths: Iterable[str]) -> str:
+    packages = [path.split(".")[:-1] for path in policy_paths]
+    root = os.path.commonprefix(packages)
+    if not root:
+        raise ValueError("policy paths must share a common root package")
+
+    return ".".join(root)
+
+
+def select_decisions(
+    decision_tree: DecisionTree, queries: Sequence[Tuple[str, Sequence[str]]]
+) -> DecisionTree:
+    # Decisions that the policy doesn't define are denied.
+    return {
+        path: {name: decision_tree.get(path, {}).get(name, False) for name in decisions}
+        for path, decisions in queries
+    }
 
 
 def validate_decision_tree(response: DecisionTreeResponse) -> DecisionTree:
@@ -22,13 +79,14 @@ def validate_decision_tree(response: DecisionTreeResponse) -> DecisionTree:
     decision_tree: DecisionTree = {}
 
     for path, decisions in response.path.fields.items():
-        if decisions.WhichOneof("kind") != "struct_value":
+        if not decisions.HasField("struct_value"):
             raise error
 
-        for name, decision in decisions.struct_value.fields.items():
-            if decision.WhichOneof("kind") != "bool_value":
-                raise error
+        fields = decisions.struct_value.fields
+        if not all(decision.HasField("bool_value") for decision in fields.values()):
+            raise error
 
-            decision_tree.setdefault(path, {})[name] = decision.bool_value
+        if fields:
+            decision_tree[path] = {name: decision.bool_value for name, decision in fields.items()}
 
     return decision_tree
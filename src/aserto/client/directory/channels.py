@@ -1,31 +1,31 @@
-from grpc import secure_channel, Channel, ChannelCredentials, ssl_channel_credentials
+from grpc import secure_channel, Channel, ChannelCredentials, Compression
 from typing import Optional
 
+from aserto.client._channel import ChannelOptions, ssl_credentials, with_default_options
 
-def validate_addresses(
-    address: str,
-    reader_address: str,
-    writer_address: str,
-    importer_address: str,
-    exporter_address: str,
-    model_address: str) -> None:
-    if address == "" and reader_address == "" and writer_address == "" and importer_address == "" and exporter_address == "" and model_address == "":
+
+def validate_addresses(*addresses: str) -> None:
+    if not any(addresses):
         raise ValueError("at least one directory service address must be specified")
 
 def channel_credentials(cert) -> ChannelCredentials:
     if cert:
         with open(cert, "rb") as f:
-            return ssl_channel_credentials(f.read())
+            return ssl_credentials(f.read())
     else:
-        return ssl_channel_credentials()
+        return ssl_credentials(None)
     
-def build_grpc_channel(address: str, ca_cert_path: str) -> Optional[Channel]:
-    if address == "":
-        return None
-        
+def build_grpc_channel(
+    address: str,
+    credentials: ChannelCredentials,
+    options: Optional[ChannelOptions] = None,
+    compression: Optional[Compression] = None,
+) -> Channel:
     return secure_channel(
         target=address, 
-        credentials=channel_credentials(cert=ca_cert_path),
+        credentials=credentials,
+        options=options,
+        compression=compression,
     )
 
 class Channels:
@@ -38,26 +38,33 @@ class Channels:
             importer_address: str = "",
             exporter_address: str = "",
             model_address: str = "",
+            channel_options: Optional[ChannelOptions] = None,
+            channel: Optional[Channel] = None,
+            compression: Optional[Compression] = None,
         ) -> None:
-        validate_addresses(address=default_address, reader_address=reader_address, writer_address=writer_address,
-            importer_address=importer_address, exporter_address=exporter_address, model_address=model_address)
-        
-        self._addresses = [default_address, reader_address, writer_address, importer_address, exporter_address, model_address]
+        addresses = [default_address, reader_address, writer_address, importer_address, exporter_address, model_address]
+        if channel is None:
+            validate_addresses(*addresses)
+
+        # A caller-provided channel is used for services without an address and is never closed here.
+        self._channel = channel
+        unique_addresses = dict.fromkeys(x for x in addresses if x)
         self._channels = dict()
-        for x in self._addresses:
-            if x and x not in self._channels:
-                self._channels[x] = build_grpc_channel(x, ca_cert_path=ca_cert_path)
+        if not unique_addresses:
+            return
+
+        # Read and parse the CA certificate once for all channels.
+        credentials = channel_credentials(cert=ca_cert_path)
+        options = with_default_options(channel_options)
+        self._channels = {
+            x: build_grpc_channel(x, credentials=credentials, options=options, compression=compression)
+            for x in unique_addresses
+        }
 
     def get(self, address: str, default_address: str) -> Optional[Channel]:
-        if address != "":
-            return self._channels[address]
-        if default_address != "":
-            return self._channels[default_address]
-        
-        return None
+        return self._channels.get(address) or self._channels.get(default_address) or self._channel
 
 
     def close(self) -> None:
-        for x in self._addresses:
-            if x != "" and self._channels[x] is not None:
-               self._channels[x].close()
\ No newline at end of file
+        for channel in self._channels.values():
+            channel.close()
\ No newline at end of file
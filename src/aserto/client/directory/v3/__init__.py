@@ -14,8 +14,10 @@ import grpc
 
 import aserto.client.directory as directory
 from aserto.client.directory import NotFoundError
+from aserto.client._channel import ChannelOptions
 import aserto.client.directory.v3.helpers as helpers
 from aserto.client.directory.v3.helpers import (
+    Check,
     ETagMismatchError,
     ExportOption,
     FindResponse,
@@ -40,6 +42,9 @@ class Directory:
         importer_address: str = "",
         exporter_address: str = "",
         model_address: str = "",
+        channel_options: typing.Optional[ChannelOptions] = None,
+        channel: typing.Optional[grpc.Channel] = None,
+        compression: typing.Optional[grpc.Compression] = None,
     ) -> None:
         self._channels = directory.Channels(
             default_address=address,
@@ -49,9 +54,13 @@ class Directory:
             exporter_address=exporter_address,
             model_address=model_address,
             ca_cert_path=ca_cert_path,
+            channel_options=channel_options,
+            channel=channel,
+            compression=compression,
         )
 
         self._metadata = directory.get_metadata(api_key=api_key, tenant_id=tenant_id)
+        self._manifest: typing.Optional[Manifest] = None
 
         reader_channel = self._channels.get(reader_address, address)
         self._reader = reader.ReaderStub(reader_channel) if reader_channel is not None else None
@@ -225,6 +234,34 @@ class Directory:
         )
         return response
 
+    def iter_objects(
+        self, object_type: str = "", page_size: int = helpers.MAX_PAGE_SIZE
+    ) -> typing.Iterator[Object]:
+        """Iterates over all directory objects, optionally filtered by type.
+        Objects are fetched from the directory one page at a time as the iterator advances.
+
+        Parameters
+        ----
+        object_type : str
+            the type of object to retrieve. If empty, all objects are returned.
+        page_size : int
+            the number of objects to fetch in each request. Default (and maximum): 100.
+
+        Returns
+        ----
+        Iterator[Object]
+            iterator over directory objects
+        """
+
+        page = PaginationRequest(size=page_size)
+        while True:
+            response = self.get_objects(object_type=object_type, page=page)
+            yield from response.results
+
+            if not response.page.next_token:
+                return
+            page = PaginationRequest(size=page_size, token=response.page.next_token)
+
     @typing.overload
     def set_object(self, *, object: Object) -> Object:
         """Create a new directory object or updates an existing object if an object with the same type and id already exists.
@@ -732,6 +769,32 @@ class Directory:
         )
         return response.check
 
+    def check_many(self, checks: typing.Sequence[Check]) -> typing.List[bool]:
+        """Checks, for each of a batch of checks, if a subject has a given permission or relation to an object.
+        All checks are sent concurrently over the reader's channel.
+        Returns a list with the result of each check, in the same order as the checks.
+
+        Parameters
+        ----
+        checks : typing.Sequence[Check]
+            the object, relation or permission, and subject of each check.
+
+        Returns
+        ----
+        list
+            list of True or False values
+        """
+
+        stub = self.reader()
+        futures = [stub.Check.future(c.proto, metadata=self._metadata) for c in checks]
+        try:
+            return [f.result().check for f in futures]
+        except Exception:
+            # don't leave the remaining checks running when one of them fails.
+            for f in futures:
+                f.cancel()
+            raise
+
     def check_relation(
         self,
         object_type: str,
@@ -824,6 +887,7 @@ class Directory:
     def get_manifest(self, etag: str = "") -> typing.Optional[Manifest]:
         """Returns the current manifest.
         Returns None if etag is provided and the manifest has not changed.
+        The last manifest received is cached, and its body is only downloaded again if the manifest has changed.
 
         Parameters
         ----
@@ -835,9 +899,12 @@ class Directory:
         The current manifest or None.
         """
 
+        cached = self._manifest
         headers = self._metadata
         if etag:
             headers += (("if-none-match", etag),)
+        elif cached is not None:
+            headers += (("if-none-match", cached.etag),)
 
         updated_at = datetime.datetime.min
         current_etag = ""
@@ -850,10 +917,17 @@ class Directory:
             elif field == "body":
                 body += resp.body.data
 
-        if etag and not body:
-            return None
+        if not body:
+            if etag:
+                return None
+            if cached is not None and current_etag in ("", cached.etag):
+                return cached
+
+        manifest = Manifest(updated_at, current_etag, body)
+        if body:
+            self._manifest = manifest
 
-        return Manifest(updated_at, current_etag, body)
+        return manifest
 
     def set_manifest(self, body: bytes, etag: str = "") -> None:
         """Sets the manifest.
@@ -964,6 +1038,7 @@ class Directory:
 
 
 __all__ = [
+    "Check",
     "Directory",
     "GetObjectResponse",
     "GetObjectsResponse",
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import typing
 
@@ -10,14 +11,16 @@ from aserto.directory.reader.v3 import GetObjectResponse, GetObjectsResponse
 import aserto.directory.writer.v3 as writer
 import google.protobuf.json_format as json_format
 from google.protobuf.struct_pb2 import Struct
-from grpc import RpcError, StatusCode
+from grpc import Compression, RpcError, StatusCode
 import grpc.aio as grpc
 
 import aserto.client.directory as directory
 from aserto.client.directory import NotFoundError
+from aserto.client._channel import ChannelOptions
 import aserto.client.directory.aio as aio
 import aserto.client.directory.v3.helpers as helpers
 from aserto.client.directory.v3.helpers import (
+    Check,
     ETagMismatchError,
     ExportOption,
     FindResponse,
@@ -42,6 +45,9 @@ class Directory:
         importer_address: str = "",
         exporter_address: str = "",
         model_address: str = "",
+        channel_options: typing.Optional[ChannelOptions] = None,
+        channel: typing.Optional[grpc.Channel] = None,
+        compression: typing.Optional[Compression] = None,
     ) -> None:
         self._channels = aio.Channels(
             default_address=address,
@@ -51,9 +57,13 @@ class Directory:
             exporter_address=exporter_address,
             model_address=model_address,
             ca_cert_path=ca_cert_path,
+            channel_options=channel_options,
+            channel=channel,
+            compression=compression,
         )
 
         self._metadata = directory.get_metadata(api_key=api_key, tenant_id=tenant_id)
+        self._manifest: typing.Optional[Manifest] = None
 
         reader_channel = self._channels.get(reader_address, address)
         self._reader = reader.ReaderStub(reader_channel) if reader_channel is not None else None
@@ -131,6 +141,35 @@ class Directory:
         )
         return response
 
+    async def iter_objects(
+        self, object_type: str = "", page_size: int = helpers.MAX_PAGE_SIZE
+    ) -> typing.AsyncIterator[Object]:
+        """Iterates over all directory objects, optionally filtered by type.
+        Objects are fetched from the directory one page at a time as the iterator advances.
+
+        Parameters
+        ----
+        object_type : str
+            the type of object to retrieve. If empty, all objects are returned.
+        page_size : int
+            the number of objects to fetch in each request. Default (and maximum): 100.
+
+        Returns
+        ----
+        AsyncIterator[Object]
+            iterator over directory objects
+        """
+
+        page = PaginationRequest(size=page_size)
+        while True:
+            response = await self.get_objects(object_type=object_type, page=page)
+            for obj in response.results:
+                yield obj
+
+            if not response.page.next_token:
+                return
+            page = PaginationRequest(size=page_size, token=response.page.next_token)
+
     async def get_object_many(
         self,
         identifiers: typing.Sequence[ObjectIdentifier],
@@ -735,6 +774,38 @@ class Directory:
         )
         return response.check
 
+    async def check_many(self, checks: typing.Sequence[Check]) -> typing.List[bool]:
+        """Checks, for each of a batch of checks, if a subject has a given permission or relation to an object.
+        All checks are sent concurrently over the reader's channel.
+        Returns a list with the result of each check, in the same order as the checks.
+
+        Parameters
+        ----
+        checks : typing.Sequence[Check]
+            the object, relation or permission, and subject of each check.
+
+        Returns
+        ----
+        list
+            list of True or False values
+        """
+
+        stub = self.reader()
+        tasks = [
+            asyncio.ensure_future(stub.Check(c.proto, metadata=self._metadata)) for c in checks
+        ]
+        try:
+            responses = await asyncio.gather(*tasks)
+        except Exception:
+            # gather doesn't cancel the remaining checks when one of them fails.
+            for t in tasks:
+                t.cancel()
+            # Retrieve the other failures so they aren't logged as never retrieved.
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return [r.check for r in responses]
+
     async def check_relation(
         self,
         object_type: str,
@@ -826,6 +897,7 @@ class Directory:
     async def get_manifest(self, etag: str = "") -> typing.Optional[Manifest]:
         """Returns the current manifest.
         Returns None if etag is provided and the manifest has not changed.
+        The last manifest received is cached, and its body is only downloaded again if the manifest has changed.
 
         Parameters
         ----
@@ -837,9 +909,12 @@ class Directory:
         The current manifest or None.
         """
 
+        cached = self._manifest
         headers = self._metadata
         if etag:
             headers += (("if-none-match", etag),)
+        elif cached is not None:
+            headers += (("if-none-match", cached.etag),)
 
         updated_at = datetime.datetime.min
         current_etag = ""
@@ -852,10 +927,17 @@ class Directory:
             elif field == "body":
                 body += resp.body.data
 
-        if etag and not body:
-            return None
+        if not body:
+            if etag:
+                return None
+            if cached is not None and current_etag in ("", cached.etag):
+                return cached
+
+        manifest = Manifest(updated_at, current_etag, body)
+        if body:
+            self._manifest = manifest
 
-        return Manifest(updated_at, current_etag, body)
+        return manifest
 
     async def set_manifest(self, body: bytes, etag: str = "") -> None:
         """Sets the manifest.
@@ -961,6 +1043,7 @@ class Directory:
 
 
 __all__ = [
+    "Check",
     "Directory",
     "GetObjectResponse",
     "GetObjectsResponse",
@@ -6,9 +6,11 @@ from aserto.directory.common.v3 import Object
 from aserto.directory.common.v3 import ObjectIdentifier as ObjectIdentifierProto
 from aserto.directory.common.v3 import PaginationResponse, Relation
 from aserto.directory.exporter.v3 import Option
+from aserto.directory.reader.v3 import CheckRequest
 from google.protobuf.struct_pb2 import Struct
 
 MAX_CHUNK_BYTES = 64 * 1024
+MAX_PAGE_SIZE = 100
 
 
 class ETagMismatchError(Exception):
@@ -32,6 +34,29 @@ class ObjectIdentifier:
         return ObjectIdentifierProto(object_type=self.type, object_id=self.id)
 
 
+@dataclass(frozen=True)
+class Check:
+    """
+    A single relation or permission check in a check_many call.
+    """
+
+    object_type: str
+    object_id: str
+    relation: str
+    subject_type: str
+    subject_id: str
+
+    @property
+    def proto(self) -> CheckRequest:
+        return CheckRequest(
+            object_type=self.object_type,
+            object_id=self.object_id,
+            relation=self.relation,
+            subject_type=self.subject_type,
+            subject_id=self.subject_id,
+        )
+
+
 @dataclass(frozen=True)
 class RelationResponse:
     """
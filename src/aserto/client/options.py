@@ -1,4 +1,5 @@
 import ssl
+from types import MappingProxyType
 from typing import Mapping, Optional
 
 __all__ = ["AuthorizerOptions"]
@@ -21,6 +22,13 @@ class AuthorizerOptions:
         self._cert_file_path = cert_file_path
         self._url = url
 
+        headers = {}
+        if api_key:
+            headers["authorization"] = f"basic {api_key}"
+        if tenant_id:
+            headers["aserto-tenant-id"] = tenant_id
+        self._auth_headers: Mapping[str, str] = MappingProxyType(headers)
+
     @property
     def url(self) -> str:
         return self._url
@@ -51,10 +59,4 @@ class AuthorizerOptions:
 
     @property
     def auth_headers(self) -> Mapping[str, str]:
-        headers = {}
-        if self._api_key:
-            headers["authorization"] = f"basic {self._api_key}"
-        if self._tenant_id:
-            headers["aserto-tenant-id"] = self._tenant_id
-
-        return headers
+        return self._auth_headers
@@ -65,6 +65,12 @@ def topaz():
     time.sleep(1)
 
 
+@pytest.fixture(scope="session")
+def channel_options():
+    # keepalive is configured by the clients' default channel options.
+    return [("grpc.http2.lookahead_bytes", 1024 * 1024)]
+
+
 def start_topaz() -> Topaz:
     subprocess.run(
         "topaz templates install todo --no-console --force -i",
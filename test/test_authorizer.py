@@ -1,5 +1,7 @@
+import datetime
 from typing import Dict
 
+import grpc
 import pytest
 
 from aserto.client import AuthorizerOptions, Identity
@@ -7,13 +9,14 @@ from aserto.client.authorizer import AuthorizerClient, DecisionTree, IdentityTyp
 
 
 @pytest.fixture(scope="module")
-def authorizer(topaz):
+def authorizer(topaz, channel_options):
     client = AuthorizerClient(
         identity=Identity(type=IdentityType.IDENTITY_TYPE_NONE),
         options=AuthorizerOptions(
             url=topaz.authorizer.address,
             cert_file_path=topaz.authorizer.ca_cert_path,
         ),
+        channel_options=channel_options,
     )
 
     yield client
@@ -58,3 +61,60 @@ def test_decision_grpc(authorizer) -> None:
     assert result == {
         "allowed": True,
     }
+
+
+def test_decisions_batch(authorizer: AuthorizerClient) -> None:
+    result = authorizer.decisions_batch(
+        queries=[
+            ("todoApp.GET.todos", ["allowed"]),
+            ("todoApp.GET.users.__userID", ["allowed"]),
+            ("todoApp.POST.todos", ["allowed"]),
+        ],
+        policy_instance_name="todo",
+    )
+
+    assert result == {
+        "todoApp.GET.todos": {"allowed": True},
+        "todoApp.GET.users.__userID": {"allowed": True},
+        "todoApp.POST.todos": {"allowed": False},
+    }
+
+
+def test_shared_channel(topaz) -> None:
+    with open(topaz.authorizer.ca_cert_path, "rb") as f:
+        credentials = grpc.ssl_channel_credentials(f.read())
+    channel = grpc.secure_channel(topaz.authorizer.address, credentials)
+    options = AuthorizerOptions(url=topaz.authorizer.address)
+
+    clients = [
+        AuthorizerClient(
+            identity=Identity(type=IdentityType.IDENTITY_TYPE_NONE),
+            options=options,
+            channel=channel,
+        )
+        for _ in range(2)
+    ]
+
+    # closing one client leaves the shared channel open for the other
+    clients[0].close()
+    assert make_decision_request(clients[1]) == {"allowed": True}
+    clients[1].close()
+
+    channel.close()
+
+
+def test_decision_cache(topaz) -> None:
+    client = AuthorizerClient(
+        identity=Identity(type=IdentityType.IDENTITY_TYPE_NONE),
+        options=AuthorizerOptions(
+            url=topaz.authorizer.address,
+            cert_file_path=topaz.authorizer.ca_cert_path,
+        ),
+        decision_cache_ttl=datetime.timedelta(minutes=1),
+    )
+
+    result = make_decision_request(client)
+    client.close()
+
+    # the repeated decision is served from the cache without touching the closed channel
+    assert make_decision_request(client) == result
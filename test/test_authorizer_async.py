@@ -1,20 +1,24 @@
+import datetime
 from typing import Dict
 
+import grpc.aio as grpc_aio
 import pytest
 import pytest_asyncio
+from grpc import ssl_channel_credentials
 
 from aserto.client import AuthorizerOptions, Identity
 from aserto.client.authorizer.aio import AuthorizerClient, DecisionTree, IdentityType
 
 
 @pytest_asyncio.fixture(scope="module")
-async def authorizer(topaz):
+async def authorizer(topaz, channel_options):
     client = AuthorizerClient(
         identity=Identity(type=IdentityType.IDENTITY_TYPE_NONE),
         options=AuthorizerOptions(
             url=topaz.authorizer.address,
             cert_file_path=topaz.authorizer.ca_cert_path,
         ),
+        channel_options=channel_options,
     )
 
     yield client
@@ -61,3 +65,63 @@ async def test_decision_grpc(authorizer: AuthorizerClient) -> None:
     assert result == {
         "allowed": True,
     }
+
+
+@pytest.mark.asyncio(scope="module")
+async def test_decisions_batch(authorizer: AuthorizerClient) -> None:
+    result = await authorizer.decisions_batch(
+        queries=[
+            ("todoApp.GET.todos", ["allowed"]),
+            ("todoApp.GET.users.__userID", ["allowed"]),
+            ("todoApp.POST.todos", ["allowed"]),
+        ],
+        policy_instance_name="todo",
+    )
+
+    assert result == {
+        "todoApp.GET.todos": {"allowed": True},
+        "todoApp.GET.users.__userID": {"allowed": True},
+        "todoApp.POST.todos": {"allowed": False},
+    }
+
+
+@pytest.mark.asyncio(scope="module")
+async def test_shared_channel(topaz) -> None:
+    with open(topaz.authorizer.ca_cert_path, "rb") as f:
+        credentials = ssl_channel_credentials(f.read())
+    channel = grpc_aio.secure_channel(topaz.authorizer.address, credentials)
+    options = AuthorizerOptions(url=topaz.authorizer.address)
+
+    clients = [
+        AuthorizerClient(
+            identity=Identity(type=IdentityType.IDENTITY_TYPE_NONE),
+            options=options,
+            channel=channel,
+        )
+        for _ in range(2)
+    ]
+
+    # closing one client leaves the shared channel open for the other
+    await clients[0].close()
+    assert await make_decision_request(clients[1]) == {"allowed": True}
+    await clients[1].close()
+
+    await channel.close()
+
+
+@pytest.mark.asyncio(scope="module")
+async def test_decision_cache(topaz) -> None:
+    client = AuthorizerClient(
+        identity=Identity(type=IdentityType.IDENTITY_TYPE_NONE),
+        options=AuthorizerOptions(
+            url=topaz.authorizer.address,
+            cert_file_path=topaz.authorizer.ca_cert_path,
+        ),
+        decision_cache_ttl=datetime.timedelta(minutes=1),
+    )
+
+    result = await make_decision_request(client)
+    await client.close()
+
+    # the repeated decision is served from the cache without touching the closed channel
+    assert await make_decision_request(client) == result
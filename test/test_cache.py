@@ -0,0 +1,149 @@
+import datetime
+import threading
+from typing import List
+
+import aserto.authorizer.v2 as authorizer
+import pytest
+
+import aserto.client._cache as cache_module
+from aserto.client import AuthorizerOptions, Identity
+from aserto.client._cache import TTLCache
+from aserto.client.authorizer import AuthorizerClient, IdentityType
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "monotonic", clock)
+    return clock
+
+
+def test_entries_expire(clock: Clock) -> None:
+    cache: TTLCache[int] = TTLCache(ttl=10)
+    cache.put("key", 1, cache.generation)
+
+    clock.now += 9
+    assert cache.get("key") == 1
+
+    clock.now += 1
+    assert cache.get("key") is None
+
+
+def test_maxsize_evicts_oldest_entry(clock: Clock) -> None:
+    cache: TTLCache[int] = TTLCache(ttl=10, maxsize=2)
+    for i in range(3):
+        cache.put(i, i, cache.generation)
+        clock.now += 1
+
+    assert cache.get(0) is None
+    assert cache.get(1) == 1
+    assert cache.get(2) == 2
+
+
+def test_maxsize_prefers_expired_entries(clock: Clock) -> None:
+    cache: TTLCache[int] = TTLCache(ttl=10, maxsize=2)
+    cache.put(0, 0, cache.generation)
+    clock.now += 5
+    cache.put(1, 1, cache.generation)
+    clock.now += 6
+    cache.put(2, 2, cache.generation)
+
+    assert cache.get(1) == 1
+    assert cache.get(2) == 2
+
+
+def test_maxsize_full_of_live_entries(clock: Clock) -> None:
+    cache: TTLCache[int] = TTLCache(ttl=100, maxsize=3)
+    for i in range(10):
+        cache.put(i, i, cache.generation)
+        clock.now += 1
+
+    assert len(cache._entries) == 3
+    assert [cache.get(i) for i in range(10)] == [None] * 7 + [7, 8, 9]
+
+
+def test_put_after_clear_is_dropped() -> None:
+    cache: TTLCache[int] = TTLCache(ttl=10)
+    generation = cache.generation
+    cache.put("before", 1, generation)
+
+    cache.clear()
+    cache.put("stale", 2, generation)
+
+    assert cache.get("before") is None
+    assert cache.get("stale") is None
+
+    cache.put("fresh", 3, cache.generation)
+    assert cache.get("fresh") == 3
+
+
+def test_concurrent_puts_stay_bounded() -> None:
+    cache: TTLCache[int] = TTLCache(ttl=60, maxsize=64)
+    errors: List[BaseException] = []
+
+    def fill(offset: int) -> None:
+        try:
+            for i in range(1000):
+                cache.put((offset, i), i, cache.generation)
+        except BaseException as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=fill, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache._entries) <= 64
+
+
+class IsStub:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.decisions: List[str] = []
+
+    def Is(self, request, metadata=None, timeout=None) -> authorizer.IsResponse:
+        self.calls += 1
+        self.decisions = list(request.policy_context.decisions)
+        response = authorizer.IsResponse()
+        decision = response.decisions.add(decision="allowed")
+        setattr(decision, "is", True)
+        return response
+
+
+def test_authorizer_invalidate() -> None:
+    client = AuthorizerClient(
+        identity=Identity(type=IdentityType.IDENTITY_TYPE_NONE),
+        options=AuthorizerOptions(url="localhost:8282"),
+        decision_cache_ttl=datetime.timedelta(minutes=1),
+    )
+    stub = IsStub()
+    client.client = stub  # type: ignore[assignment]
+
+    def decide() -> None:
+        assert client.decisions(
+            decisions=iter(["allowed"]),  # type: ignore[arg-type]
+            policy_instance_name="todo",
+            policy_path="todoApp.GET.todos",
+            resource_context={"id": "1"},
+        ) == {"allowed": True}
+
+    decide()
+    assert stub.decisions == ["allowed"]
+    decide()
+    assert stub.calls == 1
+
+    client.invalidate()
+    decide()
+    assert stub.calls == 2
+
+    client.close()
@@ -1,10 +1,15 @@
 import datetime
+import re
+from collections import Counter
+from typing import TypedDict
 
 import grpc
 import pytest
 
+import aserto.client.directory.channels as channels
 from aserto.client.directory import ConfigError
 from aserto.client.directory.v3 import (
+    Check,
     Directory,
     ETagMismatchError,
     ExportOption,
@@ -17,10 +22,46 @@ from aserto.client.directory.v3 import (
 )
 
 
+class RelationArgs(TypedDict):
+    object_type: str
+    object_id: str
+    relation: str
+    subject_type: str
+    subject_id: str
+
+
+EVIL_GENIUS_RICK = RelationArgs(
+    object_type="group",
+    object_id="evil_genius",
+    relation="member",
+    subject_type="user",
+    subject_id="rick@the-citadel.com",
+)
+
+EVIL_GENIUS_MORTY = RelationArgs(
+    object_type="group",
+    object_id="evil_genius",
+    relation="member",
+    subject_type="user",
+    subject_id="morty@the-citadel.com",
+)
+
+OBJECT_TYPE_REQUIRED = re.compile("object_type: value is required")
+
+OBJECT_TYPES = frozenset(("user", "group", "identity"))
+
+JERRY = ObjectIdentifier(type="user", id="jerry@the-smiths.com")
+SUMMER_IDENTITY = ObjectIdentifier(type="identity", id="summer@the-smiths.com")
+MORTY = ObjectIdentifier(type="user", id="morty@the-citadel.com")
+NO_SUCH_USER = ObjectIdentifier(type="user", id="no-such-user")
+
+
 @pytest.fixture(scope="module")
-def directory(topaz):
+def directory(topaz, channel_options):
     client = Directory(
-        address=topaz.directory_grpc.address, ca_cert_path=topaz.directory_grpc.ca_cert_path
+        address=topaz.directory_grpc.address,
+        ca_cert_path=topaz.directory_grpc.ca_cert_path,
+        channel_options=channel_options,
     )
 
     yield client
@@ -47,6 +88,45 @@ def test_client_without_writer(topaz):
         client.set_object(object=obj)
 
 
+def test_client_with_channel(topaz):
+    with open(topaz.directory_grpc.ca_cert_path, "rb") as f:
+        credentials = grpc.ssl_channel_credentials(f.read())
+    channel = grpc.secure_channel(topaz.directory_grpc.address, credentials)
+
+    with Directory(channel=channel) as client:
+        obj = client.get_object("user", "beth@the-smiths.com")
+        assert obj.id == "beth@the-smiths.com"
+
+    # closing the client leaves the caller's channel open
+    with Directory(channel=channel) as client:
+        obj = client.get_object("user", "beth@the-smiths.com")
+        assert obj.id == "beth@the-smiths.com"
+
+    channel.close()
+
+
+def test_client_with_compression(topaz, monkeypatch):
+    secure_channel = channels.secure_channel
+    channel_kwargs = []
+
+    def record_kwargs(**kwargs):
+        channel_kwargs.append(kwargs)
+        return secure_channel(**kwargs)
+
+    monkeypatch.setattr(channels, "secure_channel", record_kwargs)
+
+    with Directory(
+        address=topaz.directory_grpc.address,
+        ca_cert_path=topaz.directory_grpc.ca_cert_path,
+        compression=grpc.Compression.Gzip,
+    ) as client:
+        objs = list(client.iter_objects(object_type="user"))
+        assert len(objs) == 5
+
+    assert channel_kwargs
+    assert all(kw["compression"] == grpc.Compression.Gzip for kw in channel_kwargs)
+
+
 def test_get_object(directory: Directory):
     obj = directory.get_object(object_type="user", object_id="summer@the-smiths.com")
 
@@ -61,22 +141,25 @@ def test_object_not_found(directory: Directory):
 
 
 def test_object_invalid_arg(directory: Directory):
-    with pytest.raises(grpc.RpcError, match="object_type: value is required"):
+    with pytest.raises(grpc.RpcError) as err:
         directory.get_object("", "morty@the-citadel")
 
+    assert err.value.code() == grpc.StatusCode.INVALID_ARGUMENT  # type: ignore
+    assert OBJECT_TYPE_REQUIRED.search(err.value.details())  # type: ignore
+
 
 def test_get_objects_by_type(directory: Directory):
     objs = directory.get_objects(object_type="user", page=PaginationRequest(size=10)).results
 
     assert len(objs) == 5
-    assert all(obj.type == "user" for obj in objs)
+    assert {obj.type for obj in objs} == {"user"}
 
 
 def test_get_objects(directory: Directory):
     objs = directory.get_objects(page=PaginationRequest(size=10)).results
 
     assert len(objs) == 10
-    assert all(obj.type in ("user", "group", "identity") for obj in objs)
+    assert {obj.type for obj in objs} <= OBJECT_TYPES
 
 
 def test_get_objects_paging(directory: Directory):
@@ -89,13 +172,17 @@ def test_get_objects_paging(directory: Directory):
     assert not page_2.page.next_token
 
 
+def test_iter_objects(directory: Directory):
+    objs = list(directory.iter_objects(page_size=10))
+    assert len(objs) == 20
+
+    users = list(directory.iter_objects(object_type="user"))
+    assert len(users) == 5
+    assert {obj.type for obj in users} == {"user"}
+
+
 def test_get_objects_many(directory: Directory):
-    objs = directory.get_object_many(
-        [
-            ObjectIdentifier(type="user", id="jerry@the-smiths.com"),
-            ObjectIdentifier(type="identity", id="summer@the-smiths.com"),
-        ]
-    )
+    objs = directory.get_object_many([JERRY, SUMMER_IDENTITY])
 
     assert len(objs) == 2
     assert objs[0].type == "user"
@@ -106,13 +193,7 @@ def test_get_objects_many(directory: Directory):
 
 def test_get_objects_many_not_found(directory: Directory):
     with pytest.raises(NotFoundError):
-        directory.get_object_many(
-            [
-                ObjectIdentifier(type="user", id="jerry@the-smiths.com"),
-                ObjectIdentifier(type="identity", id="summer@the-smiths.com"),
-                ObjectIdentifier(type="user", id="no-such-user"),
-            ]
-        )
+        directory.get_object_many([JERRY, SUMMER_IDENTITY, NO_SUCH_USER])
 
 
 def test_set_object_from_message(directory: Directory):
@@ -202,13 +283,7 @@ def test_delete_relation(directory: Directory):
 
 
 def test_get_relation(directory: Directory):
-    rel = directory.get_relation(
-        object_type="group",
-        object_id="evil_genius",
-        relation="member",
-        subject_type="user",
-        subject_id="rick@the-citadel.com",
-    )
+    rel = directory.get_relation(**EVIL_GENIUS_RICK)
 
     assert rel.relation == "member"
     assert rel.object_id == "evil_genius"
@@ -216,14 +291,7 @@ def test_get_relation(directory: Directory):
 
 
 def test_get_relation_with_objects(directory: Directory):
-    resp = directory.get_relation(
-        object_type="group",
-        object_id="evil_genius",
-        relation="member",
-        subject_type="user",
-        subject_id="rick@the-citadel.com",
-        with_objects=True,
-    )
+    resp = directory.get_relation(**EVIL_GENIUS_RICK, with_objects=True)
 
     assert resp.relation.relation == "member"
     assert resp.relation.object_id == "evil_genius"
@@ -244,24 +312,12 @@ def test_get_relations(directory: Directory):
 
 
 def test_check_relation(directory: Directory):
-    check_true = directory.check_relation(
-        object_type="group",
-        object_id="evil_genius",
-        relation="member",
-        subject_type="user",
-        subject_id="rick@the-citadel.com",
-    )
+    check_true = directory.check_relation(**EVIL_GENIUS_RICK)
 
-    check_false = directory.check_relation(
-        object_type="group",
-        object_id="evil_genius",
-        relation="member",
-        subject_type="user",
-        subject_id="morty@the-citadel.com",
-    )
+    check_false = directory.check_relation(**EVIL_GENIUS_MORTY)
 
-    assert check_true == True
-    assert check_false == False
+    assert check_true is True
+    assert check_false is False
 
 
 def test_check_permission(directory: Directory):
@@ -281,8 +337,35 @@ def test_check_permission(directory: Directory):
         subject_id="beth@the-smiths.com",
     )
 
-    assert check_true == True
-    assert check_false == False
+    assert check_true is True
+    assert check_false is False
+
+
+def test_check_many(directory: Directory):
+    can_create_resource = ("resource-creator", "resource-creators", "can_create_resource")
+
+    results = directory.check_many(
+        [
+            Check("group", "evil_genius", "member", "user", "rick@the-citadel.com"),
+            Check("group", "evil_genius", "member", "user", "morty@the-citadel.com"),
+            Check(*can_create_resource, "user", "rick@the-citadel.com"),
+            Check(*can_create_resource, "user", "beth@the-smiths.com"),
+        ]
+    )
+
+    assert results == [True, False, True, False]
+
+
+def test_check_many_invalid_arg(directory: Directory):
+    with pytest.raises(grpc.RpcError) as err:
+        directory.check_many(
+            [
+                Check("group", "evil_genius", "member", "user", "rick@the-citadel.com"),
+                Check("", "evil_genius", "member", "user", "morty@the-citadel.com"),
+            ]
+        )
+
+    assert err.value.code() == grpc.StatusCode.INVALID_ARGUMENT  # type: ignore
 
 
 def test_find_objects(directory: Directory):
@@ -314,7 +397,7 @@ def test_find_subjects(directory: Directory):
     )
 
     assert len(results.results) == 3
-    assert ObjectIdentifier(type="user", id="morty@the-citadel.com") in results.results
+    assert MORTY in results.results
 
 
 def test_get_manifest(directory: Directory):
@@ -334,6 +417,26 @@ def test_get_manifest_not_modified(directory: Directory):
     assert m2 is None
 
 
+def test_get_manifest_cached(directory: Directory, monkeypatch):
+    m1 = directory.get_manifest()
+
+    stub = directory.model()
+    get_manifest = stub.GetManifest
+    sent_metadata = []
+
+    def record_metadata(request, metadata):
+        sent_metadata.append(metadata)
+        return get_manifest(request, metadata=metadata)
+
+    monkeypatch.setattr(stub, "GetManifest", record_metadata)
+
+    m2 = directory.get_manifest()
+
+    # the cached manifest is returned as-is after the server reports it unchanged
+    assert m2 is m1
+    assert ("if-none-match", m1.etag) in sent_metadata[0]
+
+
 def test_set_manifest(directory: Directory):
     manifest = directory.get_manifest()
     assert manifest.body is not None
@@ -408,13 +511,7 @@ def test_import(directory: Directory):
 
 
 def test_export(directory: Directory):
-    obj_count = 0
-    rel_count = 0
-    for item in directory.export_data(ExportOption.OPTION_DATA):
-        if isinstance(item, Object):
-            obj_count += 1
-        elif isinstance(item, Relation):
-            rel_count += 1
-
-    assert obj_count == 21
-    assert rel_count == 25
+    counts = Counter(type(item) for item in directory.export_data(ExportOption.OPTION_DATA))
+
+    assert counts[Object] == 21
+    assert counts[Relation] == 25
@@ -1,11 +1,17 @@
+import asyncio
 import datetime
+import re
+from collections import Counter
+from typing import TypedDict
 
-from grpc import RpcError
+import grpc.aio as grpc_aio
 import pytest
 import pytest_asyncio
+from grpc import Compression, RpcError, StatusCode, ssl_channel_credentials
 
 from aserto.client.directory import ConfigError
 from aserto.client.directory.v3.aio import (
+    Check,
     Directory,
     ETagMismatchError,
     ExportOption,
@@ -18,10 +24,46 @@ from aserto.client.directory.v3.aio import (
 )
 
 
+class RelationArgs(TypedDict):
+    object_type: str
+    object_id: str
+    relation: str
+    subject_type: str
+    subject_id: str
+
+
+EVIL_GENIUS_RICK = RelationArgs(
+    object_type="group",
+    object_id="evil_genius",
+    relation="member",
+    subject_type="user",
+    subject_id="rick@the-citadel.com",
+)
+
+EVIL_GENIUS_MORTY = RelationArgs(
+    object_type="group",
+    object_id="evil_genius",
+    relation="member",
+    subject_type="user",
+    subject_id="morty@the-citadel.com",
+)
+
+OBJECT_TYPE_REQUIRED = re.compile("object_type: value is required")
+
+OBJECT_TYPES = frozenset(("user", "group", "identity"))
+
+JERRY = ObjectIdentifier(type="user", id="jerry@the-smiths.com")
+SUMMER_IDENTITY = ObjectIdentifier(type="identity", id="summer@the-smiths.com")
+MORTY = ObjectIdentifier(type="user", id="morty@the-citadel.com")
+NO_SUCH_USER = ObjectIdentifier(type="user", id="no-such-user")
+
+
 @pytest_asyncio.fixture(scope="module")
-async def directory(topaz):
+async def directory(topaz, channel_options):
     client = Directory(
-        address=topaz.directory_grpc.address, ca_cert_path=topaz.directory_grpc.ca_cert_path
+        address=topaz.directory_grpc.address,
+        ca_cert_path=topaz.directory_grpc.ca_cert_path,
+        channel_options=channel_options,
     )
 
     yield client
@@ -49,6 +91,52 @@ async def test_client_without_writer(topaz):
         await client.set_object(object=obj)
 
 
+@pytest.mark.asyncio(scope="module")
+async def test_client_with_channel(topaz):
+    with open(topaz.directory_grpc.ca_cert_path, "rb") as f:
+        credentials = ssl_channel_credentials(f.read())
+    channel = grpc_aio.secure_channel(topaz.directory_grpc.address, credentials)
+
+    client = Directory(channel=channel)
+    obj = await client.get_object("user", "beth@the-smiths.com")
+    assert obj.id == "beth@the-smiths.com"
+    await client.close()
+
+    # closing the client leaves the caller's channel open
+    client = Directory(channel=channel)
+    obj = await client.get_object("user", "beth@the-smiths.com")
+    assert obj.id == "beth@the-smiths.com"
+    await client.close()
+
+    await channel.close()
+
+
+@pytest.mark.asyncio(scope="module")
+async def test_client_with_compression(topaz, monkeypatch):
+    secure_channel = grpc_aio.secure_channel
+    channel_kwargs = []
+
+    def record_kwargs(**kwargs):
+        channel_kwargs.append(kwargs)
+        return secure_channel(**kwargs)
+
+    monkeypatch.setattr(grpc_aio, "secure_channel", record_kwargs)
+
+    client = Directory(
+        address=topaz.directory_grpc.address,
+        ca_cert_path=topaz.directory_grpc.ca_cert_path,
+        compression=Compression.Gzip,
+    )
+    try:
+        objs = [obj async for obj in client.iter_objects(object_type="user")]
+        assert len(objs) == 5
+    finally:
+        await client.close()
+
+    assert channel_kwargs
+    assert all(kw["compression"] == Compression.Gzip for kw in channel_kwargs)
+
+
 @pytest.mark.asyncio(scope="module")
 async def test_get_object(directory: Directory):
     obj = await directory.get_object(object_type="user", object_id="summer@the-smiths.com")
@@ -66,9 +154,12 @@ async def test_object_not_found(directory: Directory):
 
 @pytest.mark.asyncio(scope="module")
 async def test_object_invalid_arg(directory: Directory):
-    with pytest.raises(RpcError, match="object_type: value is required"):
+    with pytest.raises(RpcError) as err:
         await directory.get_object("", "morty@the-citadel")
 
+    assert err.value.code() == StatusCode.INVALID_ARGUMENT  # type: ignore
+    assert OBJECT_TYPE_REQUIRED.search(err.value.details())  # type: ignore
+
 
 @pytest.mark.asyncio(scope="module")
 async def test_get_objects_by_type(directory: Directory):
@@ -76,7 +167,7 @@ async def test_get_objects_by_type(directory: Directory):
     objs = resp.results
 
     assert len(objs) == 5
-    assert all(obj.type == "user" for obj in objs)
+    assert {obj.type for obj in objs} == {"user"}
 
 
 @pytest.mark.asyncio(scope="module")
@@ -85,7 +176,7 @@ async def test_get_objects(directory: Directory):
     objs = resp.results
 
     assert len(objs) == 10
-    assert all(obj.type in ("user", "group", "identity") for obj in objs)
+    assert {obj.type for obj in objs} <= OBJECT_TYPES
 
 
 @pytest.mark.asyncio(scope="module")
@@ -101,14 +192,19 @@ async def test_get_objects_paging(directory: Directory):
     assert not page_2.page.next_token
 
 
+@pytest.mark.asyncio(scope="module")
+async def test_iter_objects(directory: Directory):
+    objs = [obj async for obj in directory.iter_objects(page_size=10)]
+    assert len(objs) == 20
+
+    users = [obj async for obj in directory.iter_objects(object_type="user")]
+    assert len(users) == 5
+    assert {obj.type for obj in users} == {"user"}
+
+
 @pytest.mark.asyncio(scope="module")
 async def test_get_objects_many(directory: Directory):
-    objs = await directory.get_object_many(
-        [
-            ObjectIdentifier(type="user", id="jerry@the-smiths.com"),
-            ObjectIdentifier(type="identity", id="summer@the-smiths.com"),
-        ]
-    )
+    objs = await directory.get_object_many([JERRY, SUMMER_IDENTITY])
 
     assert len(objs) == 2
     assert objs[0].type == "user"
@@ -120,13 +216,7 @@ async def test_get_objects_many(directory: Directory):
 @pytest.mark.asyncio(scope="module")
 async def test_get_objects_many_not_found(directory: Directory):
     with pytest.raises(NotFoundError):
-        await directory.get_object_many(
-            [
-                ObjectIdentifier(type="user", id="jerry@the-smiths.com"),
-                ObjectIdentifier(type="identity", id="summer@the-smiths.com"),
-                ObjectIdentifier(type="user", id="no-such-user"),
-            ]
-        )
+        await directory.get_object_many([JERRY, SUMMER_IDENTITY, NO_SUCH_USER])
 
 
 @pytest.mark.asyncio(scope="module")
@@ -221,13 +311,7 @@ async def test_delete_relation(directory: Directory):
 
 @pytest.mark.asyncio(scope="module")
 async def test_get_relation(directory: Directory):
-    rel = await directory.get_relation(
-        object_type="group",
-        object_id="evil_genius",
-        relation="member",
-        subject_type="user",
-        subject_id="rick@the-citadel.com",
-    )
+    rel = await directory.get_relation(**EVIL_GENIUS_RICK)
 
     assert rel.relation == "member"
     assert rel.object_id == "evil_genius"
@@ -236,14 +320,7 @@ async def test_get_relation(directory: Directory):
 
 @pytest.mark.asyncio(scope="module")
 async def test_get_relation_with_objects(directory: Directory):
-    resp = await directory.get_relation(
-        object_type="group",
-        object_id="evil_genius",
-        relation="member",
-        subject_type="user",
-        subject_id="rick@the-citadel.com",
-        with_objects=True,
-    )
+    resp = await directory.get_relation(**EVIL_GENIUS_RICK, with_objects=True)
 
     assert resp.relation.relation == "member"
     assert resp.relation.object_id == "evil_genius"
@@ -266,46 +343,65 @@ async def test_get_relations(directory: Directory):
 
 @pytest.mark.asyncio(scope="module")
 async def test_check_relation(directory: Directory):
-    check_true = await directory.check_relation(
-        object_type="group",
-        object_id="evil_genius",
-        relation="member",
-        subject_type="user",
-        subject_id="rick@the-citadel.com",
-    )
-
-    check_false = await directory.check_relation(
-        object_type="group",
-        object_id="evil_genius",
-        relation="member",
-        subject_type="user",
-        subject_id="morty@the-citadel.com",
+    check_true, check_false = await asyncio.gather(
+        directory.check_relation(**EVIL_GENIUS_RICK),
+        directory.check_relation(**EVIL_GENIUS_MORTY),
     )
 
-    assert check_true == True
-    assert check_false == False
+    assert check_true is True
+    assert check_false is False
 
 
 @pytest.mark.asyncio(scope="module")
 async def test_check_permission(directory: Directory):
-    check_true = await directory.check_permission(
-        object_type="resource-creator",
-        object_id="resource-creators",
-        permission="can_create_resource",
-        subject_type="user",
-        subject_id="rick@the-citadel.com",
+    check_true, check_false = await asyncio.gather(
+        directory.check_permission(
+            object_type="resource-creator",
+            object_id="resource-creators",
+            permission="can_create_resource",
+            subject_type="user",
+            subject_id="rick@the-citadel.com",
+        ),
+        directory.check_permission(
+            object_type="resource-creator",
+            object_id="resource-creators",
+            permission="can_create_resource",
+            subject_type="user",
+            subject_id="beth@the-smiths.com",
+        ),
     )
 
-    check_false = await directory.check_permission(
-        object_type="resource-creator",
-        object_id="resource-creators",
-        permission="can_create_resource",
-        subject_type="user",
-        subject_id="beth@the-smiths.com",
+    assert check_true is True
+    assert check_false is False
+
+
+@pytest.mark.asyncio(scope="module")
+async def test_check_many(directory: Directory):
+    can_create_resource = ("resource-creator", "resource-creators", "can_create_resource")
+
+    results = await directory.check_many(
+        [
+            Check("group", "evil_genius", "member", "user", "rick@the-citadel.com"),
+            Check("group", "evil_genius", "member", "user", "morty@the-citadel.com"),
+            Check(*can_create_resource, "user", "rick@the-citadel.com"),
+            Check(*can_create_resource, "user", "beth@the-smiths.com"),
+        ]
     )
 
-    assert check_true == True
-    assert check_false == False
+    assert results == [True, False, True, False]
+
+
+@pytest.mark.asyncio(scope="module")
+async def test_check_many_invalid_arg(directory: Directory):
+    with pytest.raises(RpcError) as err:
+        await directory.check_many(
+            [
+                Check("group", "evil_genius", "member", "user", "rick@the-citadel.com"),
+                Check("", "evil_genius", "member", "user", "morty@the-citadel.com"),
+            ]
+        )
+
+    assert err.value.code() == StatusCode.INVALID_ARGUMENT  # type: ignore
 
 
 @pytest.mark.asyncio(scope="module")
@@ -339,7 +435,7 @@ async def test_find_subjects(directory: Directory):
     )
 
     assert len(results.results) == 3
-    assert ObjectIdentifier(type="user", id="morty@the-citadel.com") in results.results
+    assert MORTY in results.results
 
 
 @pytest.mark.asyncio(scope="module")
@@ -361,6 +457,27 @@ async def test_get_manifest_not_modified(directory: Directory):
     assert m2 is None
 
 
+@pytest.mark.asyncio(scope="module")
+async def test_get_manifest_cached(directory: Directory, monkeypatch):
+    m1 = await directory.get_manifest()
+
+    stub = directory.model()
+    get_manifest = stub.GetManifest
+    sent_metadata = []
+
+    def record_metadata(request, metadata):
+        sent_metadata.append(metadata)
+        return get_manifest(request, metadata=metadata)
+
+    monkeypatch.setattr(stub, "GetManifest", record_metadata)
+
+    m2 = await directory.get_manifest()
+
+    # the cached manifest is returned as-is after the server reports it unchanged
+    assert m2 is m1
+    assert ("if-none-match", m1.etag) in sent_metadata[0]
+
+
 @pytest.mark.asyncio(scope="module")
 async def test_set_manifest(directory: Directory):
     manifest = await directory.get_manifest()
@@ -409,13 +526,7 @@ async def test_import(directory: Directory):
 
 @pytest.mark.asyncio(scope="module")
 async def test_export(directory: Directory):
-    obj_count = 0
-    rel_count = 0
-    async for item in directory.export_data(ExportOption.OPTION_DATA):
-        if isinstance(item, Object):
-            obj_count += 1
-        elif isinstance(item, Relation):
-            rel_count += 1
-
-    assert obj_count == 21
-    assert rel_count == 25
+    counts = Counter([type(item) async for item in directory.export_data(ExportOption.OPTION_DATA)])
+
+    assert counts[Object] == 21
+    assert counts[Relation] == 25